@@ -2,10 +2,13 @@
 
 # flake8:noqa
 
+import typing
+
 from planetary_computer.sas import (
     sign,
     sign_inplace,
     sign_url,
+    sign_urls,
     sign_item,
     sign_assets,
     sign_asset,
@@ -16,7 +19,12 @@ from planetary_computer._adlfs import get_adlfs_filesystem, get_container_client
 
 from planetary_computer.version import __version__
 
+if typing.TYPE_CHECKING:
+    from planetary_computer.async_sas import async_sign_item_collection, async_sign_url
+
 __all__ = [
+    "async_sign_item_collection",
+    "async_sign_url",
     "get_adlfs_filesystem",
     "get_container_client",
     "set_subscription_key",
@@ -26,6 +34,16 @@ __all__ = [
     "sign_item_collection",
     "sign_item",
     "sign_url",
+    "sign_urls",
     "sign",
     "__version__",
 ]
+
+
+def __getattr__(name: str) -> typing.Any:
+    # The asynchronous API imports asyncio, so it's only loaded once it's used
+    if name in ("async_sign_item_collection", "async_sign_url"):
+        from planetary_computer import async_sas
+
+        return getattr(async_sas, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
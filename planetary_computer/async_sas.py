@@ -0,0 +1,230 @@
+"""Asynchronous signing, for bulk signing from within an event loop"""
+
+import asyncio
+import contextlib
+import email.utils
+import time
+import typing
+import weakref
+from typing import Dict, Optional, cast
+
+from pystac import ItemCollection
+
+from planetary_computer.settings import Settings
+from planetary_computer.sas import (
+    TOKEN_CACHE,
+    SASToken,
+    _blob_location,
+    _collect_blob_locations,
+    _fsspec_location,
+    _is_fresh,
+    _parse_token_response,
+    _read_token_file,
+    _token_request_headers,
+    _write_token_file,
+    sign_item_collection,
+)
+
+if typing.TYPE_CHECKING:
+    import httpx
+
+
+_Locks = Dict[str, asyncio.Lock]
+
+# Locks are bound to an event loop, so keep one set of per-URL locks per loop
+_LOCKS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Locks]" = (
+    weakref.WeakKeyDictionary()
+)
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+# The statuses whose Retry-After header is respected, as in urllib3
+_RETRY_AFTER_STATUSES = {413, 429, 503}
+
+
+def _new_client() -> "httpx.AsyncClient":
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError(
+            "Asynchronous signing requires the optional dependency 'httpx'."
+        ) from e
+    return httpx.AsyncClient()
+
+
+def _lock(token_request_url: str) -> asyncio.Lock:
+    locks = _LOCKS.setdefault(asyncio.get_running_loop(), {})
+    return locks.setdefault(token_request_url, asyncio.Lock())
+
+
+async def async_get_token(
+    account_name: str,
+    container_name: str,
+    client: Optional["httpx.AsyncClient"] = None,
+    retry_total: int = 10,
+    retry_backoff_factor: float = 0.8,
+) -> SASToken:
+    """
+    Get a token for a container in a storage account, asynchronously.
+
+    Tokens are shared with :func:`planetary_computer.sas.get_token` through the
+    token cache.
+
+    Args:
+        account_name (str): The storage account name.
+        container_name (str): The storage container name.
+        client (httpx.AsyncClient, optional): The client to request tokens with.
+            A new client is created (and closed) if one isn't provided.
+        retry_total (int): The number of allowable retry attempts for REST API
+            calls, after connection errors, timeouts, or error responses. Use
+            retry_total=0 to disable retries.
+        retry_backoff_factor (float): A backoff factor to apply between attempts
+            after the second try, following the same policy as
+            :func:`planetary_computer.sas.get_token`.
+
+    Returns:
+        SASToken: the generated token
+    """
+    settings = Settings.get()
+    token_request_url = f"{settings.sas_url}/{account_name}/{container_name}"
+    token = TOKEN_CACHE.get(token_request_url)
+    if _is_fresh(token):
+        return cast(SASToken, token)
+
+    async with _lock(token_request_url):
+        # Another task may have refreshed the token while we waited
+        token = TOKEN_CACHE.get(token_request_url)
+        loop = asyncio.get_running_loop()
+        if not _is_fresh(token) and settings.token_cache_file:
+            # Keep the file I/O off the event loop
+            token = await loop.run_in_executor(
+                None, _read_token_file, settings.token_cache_file, token_request_url
+            )
+        if not _is_fresh(token):
+            async with contextlib.AsyncExitStack() as stack:
+                if client is None:
+                    client = await stack.enter_async_context(_new_client())
+                token = await _request_token(
+                    client,
+                    token_request_url,
+                    settings.subscription_key,
+                    retry_total,
+                    retry_backoff_factor,
+                )
+            if settings.token_cache_file:
+                await loop.run_in_executor(
+                    None,
+                    _write_token_file,
+                    settings.token_cache_file,
+                    token_request_url,
+                    token,
+                )
+        TOKEN_CACHE[token_request_url] = cast(SASToken, token)
+    return cast(SASToken, token)
+
+
+async def _request_token(
+    client: "httpx.AsyncClient",
+    token_request_url: str,
+    subscription_key: Optional[str],
+    retry_total: int,
+    retry_backoff_factor: float,
+) -> SASToken:
+    import httpx
+
+    headers = _token_request_headers(subscription_key)
+    for attempt in range(retry_total + 1):
+        # Like urllib3, retry immediately the first time, then back off
+        backoff = retry_backoff_factor * 2 ** (attempt - 1) if attempt else 0
+        try:
+            response = await client.get(token_request_url, headers=headers)
+        except httpx.TransportError:
+            # Connection errors and timeouts
+            if attempt == retry_total:
+                raise
+            await asyncio.sleep(backoff)
+            continue
+        if response.status_code not in _RETRY_STATUSES or attempt == retry_total:
+            break
+        retry_after = _retry_after(response)
+        await asyncio.sleep(backoff if retry_after is None else retry_after)
+    response.raise_for_status()
+    return _parse_token_response(response.content)
+
+
+def _retry_after(response: "httpx.Response") -> Optional[float]:
+    """The number of seconds a response's Retry-After header asks to wait"""
+    value = response.headers.get("Retry-After")
+    if value is None or response.status_code not in _RETRY_AFTER_STATUSES:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+async def async_sign_url(url: str, client: Optional["httpx.AsyncClient"] = None) -> str:
+    """Sign a URL with a Shared Access (SAS) Token, asynchronously
+
+    See :func:`planetary_computer.sign_url` for more.
+
+    Args:
+        url (str): The HREF of the asset as a URL
+        client (httpx.AsyncClient, optional): The client to request tokens with.
+
+    Returns:
+        str: The signed HREF
+    """
+    location = _blob_location(url)
+    if location is None:
+        return url
+    token = await async_get_token(*location, client=client)
+    return url + token._suffix
+
+
+async def async_sign_item_collection(
+    item_collection: ItemCollection,
+    copy: bool = True,
+    client: Optional["httpx.AsyncClient"] = None,
+) -> ItemCollection:
+    """Sign a PySTAC item collection, asynchronously
+
+    The tokens for every container referenced by the collection are requested
+    concurrently, after which the assets are signed from the token cache. See
+    :func:`planetary_computer.sign_item_collection` for more.
+
+    Args:
+        item_collection (ItemCollection): The ItemCollection whose assets will be
+            signed
+        copy (bool): Whether to copy (clone) the ItemCollection or mutate it
+            inplace.
+        client (httpx.AsyncClient, optional): The client to request tokens with.
+            A new client is created (and closed) if one isn't provided.
+
+    Returns:
+        ItemCollection: An ItemCollection where all assets' HREFs for each item
+        have been replaced with a signed version.
+    """
+    if copy:
+        item_collection = item_collection.clone()
+
+    assets = [asset for item in item_collection for asset in item.assets.values()]
+    locations = _collect_blob_locations(asset.href for asset in assets)
+    for asset in assets:
+        fsspec_location = _fsspec_location(asset.extra_fields, asset.href)
+        if fsspec_location is not None:
+            locations.add(fsspec_location[1:])
+    if locations:
+        async with contextlib.AsyncExitStack() as stack:
+            if client is None:
+                client = await stack.enter_async_context(_new_client())
+            await asyncio.gather(
+                *(async_get_token(*loc, client=client) for loc in locations)
+            )
+
+    # Every token is cached now, so this doesn't block on the network
+    return sign_item_collection(item_collection, copy=False)
@@ -1,56 +1,170 @@
 import re
-from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Mapping, TypeVar, cast
+from datetime import datetime
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Mapping,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 import collections.abc
+import concurrent.futures
+import dataclasses
+import json
+import os
+import tempfile
+import sys
+import threading
+import time
+import typing
 from copy import deepcopy
 import warnings
 
-from functools import singledispatch
-from urllib.parse import urlparse, parse_qs
-import requests
-import requests.adapters
-import packaging.version
-import pydantic
-from pydantic import BaseModel, Field
+import functools
+from functools import lru_cache, singledispatch
+from urllib.parse import urlparse
 from pystac import Asset, Item, ItemCollection, STACObjectType, Collection
-from pystac.utils import datetime_to_str
+from pystac.utils import datetime_to_str, str_to_datetime
 from pystac.serialization.identify import identify_stac_object_type
-from pystac_client import ItemSearch
-import pystac_client
-import urllib3.util.retry
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads  # type: ignore [assignment]
 
 from planetary_computer.settings import Settings
 from planetary_computer.utils import (
     parse_blob_url,
     parse_adlfs_url,
-    is_fsspec_asset,
     is_vrt_string,
     asset_xpr,
+    _find_storage_options,
 )
+from planetary_computer.version import __version__
 
-_PYDANTIC_2_0 = packaging.version.parse(
-    pydantic.__version__
-) >= packaging.version.parse("2.0.0")
-
+if typing.TYPE_CHECKING:
+    # requests and pystac_client are imported when they're first needed, to
+    # keep importing planetary_computer fast
+    import requests
+    from pystac_client import ItemSearch
 
 BLOB_STORAGE_DOMAIN = ".blob.core.windows.net"
 AssetLike = TypeVar("AssetLike", Asset, Dict[str, Any])
+# The storage options, account, and container of an fsspec asset
+FsspecLocation = Tuple[Dict[str, Any], str, str]
+SASBaseType = TypeVar("SASBaseType", bound="SASBase")
+
+# Matches a query string that already has SAS token parameters (with values)
+_SIGNED_QUERY_XPR = re.compile(r"(?:^|&)(?:st|se|sp)=[^&]")
 
 
-class SASBase(BaseModel):
+def _parse_expiry(value: Union[str, datetime]) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    try:
+        # Fast path for the RFC 3339 timestamps returned by the SAS API
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        # Python < 3.11 only accepts a subset of ISO 8601
+        return str_to_datetime(value)
+
+
+def _accepts_expiry_alias(cls: Type[SASBaseType]) -> Type[SASBaseType]:
+    """Let a response class be created with the expiry named "msft:expiry"
+
+    These were pydantic models, which accepted both names, so
+    ``SASToken(**response_json)`` keeps working.
+    """
+    init = cls.__init__
+
+    @functools.wraps(init)
+    def __init__(self: SASBaseType, *args: Any, **kwargs: Any) -> None:
+        if "msft:expiry" in kwargs:
+            kwargs["expiry"] = kwargs.pop("msft:expiry")
+        init(self, *args, **kwargs)
+
+    cls.__init__ = __init__  # type: ignore [assignment, method-assign]
+    return cls
+
+
+@_accepts_expiry_alias
+@dataclasses.dataclass
+class SASBase:
     """Base model for responses."""
 
-    expiry: datetime = Field(alias="msft:expiry")
+    expiry: datetime
     """RFC339 datetime format of the time this token will expire"""
 
-    class Config:
-        if _PYDANTIC_2_0:
-            populate_by_name = True
-        else:
-            allow_population_by_field_name = True
-            json_encoders = {datetime: datetime_to_str}
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "expiry":
+            # Accept RFC 3339 strings, as the pydantic models did
+            value = _parse_expiry(value)
+        super().__setattr__(name, value)
+
+    @classmethod
+    def from_dict(cls: Type[SASBaseType], d: Mapping[str, Any]) -> SASBaseType:
+        """Create from a SAS API response, which names the expiry "msft:expiry" """
+        kwargs = {}
+        for field in dataclasses.fields(cls):
+            if not field.init:
+                continue
+            key = "msft:expiry" if field.name == "expiry" else field.name
+            if key not in d and field.name not in d:
+                raise ValueError(f"Missing field '{key}' in {d}")
+            kwargs[field.name] = d.get(key, d.get(field.name))
+        return cls(**kwargs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The JSON-serializable form of this response, as returned by the API"""
+        d = {f.name: getattr(self, f.name) for f in dataclasses.fields(self) if f.init}
+        d["msft:expiry"] = datetime_to_str(d.pop("expiry"))
+        return d
+
+    @classmethod
+    def parse_obj(cls: Type[SASBaseType], obj: Mapping[str, Any]) -> SASBaseType:
+        warnings.warn(
+            "'parse_obj' is deprecated and will be removed in a future version. Use "
+            "'from_dict' instead.",
+            FutureWarning,
+            stacklevel=2,
+        )
+        return cls.from_dict(obj)
+
+    def dict(self, by_alias: bool = False) -> Dict[str, Any]:
+        warnings.warn(
+            "'dict' is deprecated and will be removed in a future version. Use "
+            "'to_dict' instead.",
+            FutureWarning,
+            stacklevel=2,
+        )
+        d = self.to_dict()
+        d["msft:expiry"] = self.expiry
+        if not by_alias:
+            d["expiry"] = d.pop("msft:expiry")
+        return d
+
+    def json(self, by_alias: bool = False) -> str:
+        warnings.warn(
+            "'json' is deprecated and will be removed in a future version. Use "
+            "'to_dict' instead.",
+            FutureWarning,
+            stacklevel=2,
+        )
+        d = self.to_dict()
+        if not by_alias:
+            d["expiry"] = d.pop("msft:expiry")
+        return json.dumps(d)
 
 
+@_accepts_expiry_alias
+@dataclasses.dataclass
 class SignedLink(SASBase):
     """Signed SAS URL response"""
 
@@ -58,6 +172,8 @@ class SignedLink(SASBase):
     """The HREF in the format of a URL that can be used in HTTP GET operations"""
 
 
+@_accepts_expiry_alias
+@dataclasses.dataclass
 class SASToken(SASBase):
     """SAS Token response"""
 
@@ -65,20 +181,73 @@ class SASToken(SASBase):
     """The Shared Access (SAS) Token that can be used to access the data
     in, for example, Azure's Python SDK"""
 
+    _expiry_timestamp: float = dataclasses.field(init=False, repr=False, compare=False)
+    _expiry_monotonic: float = dataclasses.field(init=False, repr=False, compare=False)
+    _suffix: str = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # These are used for every URL signed, so derive them once up front:
+        # the expiry as a POSIX timestamp, to avoid datetime arithmetic in
+        # ttl(), the expiry on the monotonic clock, for the cache's freshness
+        # check, and the query string appended to signed HREFs.
+        super().__setattr__(name, value)
+        if name == "expiry":
+            expiry_timestamp = self.expiry.timestamp()
+            super().__setattr__("_expiry_timestamp", expiry_timestamp)
+            super().__setattr__(
+                "_expiry_monotonic",
+                time.monotonic() + (expiry_timestamp - time.time()),
+            )
+        elif name == "token":
+            super().__setattr__("_suffix", "?" + value)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # The monotonic expiry only means something in this process, so it's
+        # derived again when unpickling (e.g. on a Dask worker)
+        return type(self), (self.expiry, self.token)
+
     def sign(self, href: str) -> SignedLink:
         """Signs an href with this token"""
-        return SignedLink(
-            href=f"{href}?{self.token}", expiry=self.expiry  # type: ignore [call-arg]
-        )
+        return SignedLink(href=href + self._suffix, expiry=self.expiry)
 
     def ttl(self) -> float:
         """Number of seconds the token is still valid for"""
-        return (self.expiry - datetime.now(timezone.utc)).total_seconds()
+        return self._expiry_timestamp - time.time()
+
+
+def _is_fresh(token: Optional[SASToken], margin: float = 60) -> bool:
+    """Whether a cached token can be used without refreshing it first"""
+    # Refresh the token if there's less than a minute remaining,
+    # in order to give a small amount of buffer
+    return token is not None and time.monotonic() < token._expiry_monotonic - margin
+
+
+# Tokens with less than this many seconds remaining are refreshed in the
+# background, while the current token is still handed out
+_BACKGROUND_REFRESH_MARGIN = 300
+
+
+class _TokenCache(Dict[str, SASToken]):
+    """A dictionary of tokens, with a lock per key to serialize refreshes"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def lock(self, key: str) -> threading.Lock:
+        """The lock to hold while refreshing the token for ``key``"""
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _reset_locks(self) -> None:
+        self._locks = {}
+        self._locks_lock = threading.Lock()
 
 
 # Cache of signing requests so we can reuse them
 # Key is the signing URL, value is the SAS token
-TOKEN_CACHE: Dict[str, SASToken] = {}
+TOKEN_CACHE = _TokenCache()
 
 
 @singledispatch
@@ -94,6 +263,11 @@ def sign(obj: Any, copy: bool = True) -> Any:
     Returns:
         Any: A copy of the object where all relevant URLs have been signed
     """
+    # ItemSearch isn't registered, to avoid importing pystac_client up front.
+    # Anyone passing an ItemSearch has imported it already.
+    pystac_client = sys.modules.get("pystac_client")
+    if pystac_client is not None and isinstance(obj, pystac_client.ItemSearch):
+        return _search_and_sign(obj, copy=copy)
     raise TypeError(
         "Invalid type, must be one of: str, Asset, Item, ItemCollection, "
         "ItemSearch, or mapping"
@@ -151,26 +325,150 @@ def sign_url(url: str, copy: bool = True) -> str:
     Returns:
         str: The signed HREF
     """
-    parsed_url = urlparse(url.rstrip("/"))
-    if not parsed_url.netloc.endswith(BLOB_STORAGE_DOMAIN):
-        return url
-    elif parsed_url.netloc == "ai4edatasetspublicassets.blob.core.windows.net":
-        # special case for public assets storing thumbnails...
+    location = _blob_location(url)
+    if location is None:
         return url
 
-    parsed_qs = parse_qs(parsed_url.query)
-    if set(parsed_qs) & {"st", "se", "sp"}:
+    # Equivalent to get_token(...).sign(url).href, without building a SignedLink
+    return url + get_token(*location)._suffix
+
+
+def sign_urls(urls: Iterable[str]) -> List[str]:
+    """Sign many URLs with Shared Access (SAS) Tokens
+
+    This gives the same result as calling :func:`sign_url` on each URL, but the
+    tokens for all the storage containers involved are requested concurrently
+    up front, and each URL is then signed with a dictionary lookup.
+
+    Args:
+        urls (Iterable[str]): The HREFs to sign. Only URLs to assets in Azure
+            Blob Storage are signed, other URLs are returned unmodified.
+
+    Returns:
+        List[str]: The signed HREFs, in the same order as ``urls``
+    """
+    urls = list(urls)
+    locations = [_blob_location(url) for url in urls]
+    _prefetch_tokens(location for location in locations if location is not None)
+    return _sign_urls(urls, locations)
+
+
+def _sign_urls(
+    urls: List[str], locations: List[Optional[Tuple[str, str]]]
+) -> List[str]:
+    """Sign URLs whose blob locations (see :func:`_blob_location`) are known
+
+    URLs without a location are returned unmodified.
+    """
+    unique_locations = {location for location in locations if location is not None}
+    suffixes = {location: get_token(*location)._suffix for location in unique_locations}
+    return [
+        url if location is None else url + suffixes[location]
+        for url, location in zip(urls, locations)
+    ]
+
+
+def _blob_location(url: str) -> Optional[Tuple[str, str]]:
+    """The storage account and container of a URL that needs to be signed
+
+    Returns None for URLs outside of Azure Blob Storage, public assets, and
+    URLs that have already been signed.
+    """
+    if BLOB_STORAGE_DOMAIN not in url:
+        # Cheap enough to skip all parsing for most non-Azure URLs
+        return None
+
+    url, _, query = url.rstrip("/").partition("?")
+    if query and _SIGNED_QUERY_XPR.search(query):
         #  looks like we've already signed it
-        return url
+        return None
+
+    # Every blob in a container shares the "{scheme}://{netloc}/{container}/"
+    # prefix, so parsing it once per container is enough.
+    netloc_start = url.find("://") + 3
+    container_start = url.find("/", netloc_start) + 1
+    container_end = url.find("/", container_start) if container_start else -1
+    url_prefix = url if container_end <= container_start else url[: container_end + 1]
+    return _parse_blob_url_prefix(url_prefix)
+
+
+@lru_cache(maxsize=4096)
+def _parse_blob_url_prefix(url_prefix: str) -> Optional[Tuple[str, str]]:
+    # Blob URLs have a fixed shape, so a couple of str.find calls are enough
+    # to split "https://{account}.blob.core.windows.net/{container}/".
+    netloc_start = url_prefix.find("://") + 3
+    path_start = url_prefix.find("/", netloc_start)
+    container = url_prefix[path_start + 1 : -1]
+    if (
+        netloc_start == 2
+        or path_start == -1
+        or not url_prefix.endswith("/")
+        or not container
+        or "/" in container
+    ):
+        # Anything unusual goes through urlparse, which raises the usual errors
+        parsed_url = urlparse(url_prefix)
+        if not _is_signable_netloc(parsed_url.netloc):
+            return None
+        return parse_blob_url(parsed_url)
+
+    netloc = url_prefix[netloc_start:path_start]
+    if not _is_signable_netloc(netloc):
+        return None
+    return netloc.split(".", 1)[0], container
+
+
+def _is_signable_netloc(netloc: str) -> bool:
+    # ai4edatasetspublicassets is a special case for public assets storing
+    # thumbnails...
+    return (
+        netloc.endswith(BLOB_STORAGE_DOMAIN)
+        and netloc != "ai4edatasetspublicassets.blob.core.windows.net"
+    )
+
+
+def _collect_blob_locations(hrefs: Iterable[str]) -> Set[Tuple[str, str]]:
+    """The unique (account, container) pairs of all HREFs that need signing"""
+    locations = set()
+    for href in hrefs:
+        location = _blob_location(href)
+        if location is not None:
+            locations.add(location)
+    return locations
 
-    account, container = parse_blob_url(parsed_url)
-    token = get_token(account, container)
-    return token.sign(url).href
 
+def _prefetch_tokens(
+    locations: Iterable[Tuple[str, str]], max_workers: int = 16
+) -> None:
+    """Concurrently fetch the tokens missing from the cache for many containers
+
+    Signing afterwards only needs tokens from the cache, so the cost of
+    requesting tokens for N containers is roughly one round trip rather than N.
+    """
+    sas_url = Settings.get().sas_url
+    missing = []
+    for account, container in set(locations):
+        if not _is_fresh(TOKEN_CACHE.get(f"{sas_url}/{account}/{container}")):
+            missing.append((account, container))
+
+    if len(missing) < 2:
+        # Nothing to gain from a thread pool; signing will fetch it on demand
+        return
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(max_workers, len(missing))
+    ) as executor:
+        # Consume the results so that any request errors are raised here
+        list(executor.map(lambda location: get_token(*location), missing))
 
-def _repl_vrt(m: re.Match) -> str:
-    # replace all blob-storages URLs with a signed version.
-    return sign_url(m.string[slice(*m.span())])
+
+def _vrt_location(m: re.Match) -> Optional[Tuple[str, str]]:
+    """The storage account and container of a URL matched by asset_xpr"""
+    if "?" in m.group(0) or m["account"] == "ai4edatasetspublicassets":
+        # _blob_location knows which of these to leave alone
+        return _blob_location(m.group(0))
+    # asset_xpr has already split out the account and container
+    return m["account"], m["container"]
 
 
 def sign_vrt_string(vrt: str, copy: bool = True) -> str:
@@ -206,7 +504,27 @@ def sign_vrt_string(vrt: str, copy: bool = True) -> str:
     ...
     </VRTDataset>
     """
-    return asset_xpr.sub(_repl_vrt, vrt)
+    if BLOB_STORAGE_DOMAIN not in vrt:
+        # Nothing to sign, so skip scanning the VRT with the regex
+        return vrt
+
+    # Match the URLs once, then look up one token per container rather than
+    # one per URL
+    matches = list(asset_xpr.finditer(vrt))
+    locations = [_vrt_location(m) for m in matches]
+    unique_locations = {location for location in locations if location is not None}
+    # Mosaics can span many containers, whose tokens are requested concurrently
+    _prefetch_tokens(unique_locations)
+    suffixes = {location: get_token(*location)._suffix for location in unique_locations}
+    parts = []
+    end = 0
+    for m, location in zip(matches, locations):
+        if location is not None:
+            parts.append(vrt[end : m.end()])
+            parts.append(suffixes[location])
+            end = m.end()
+    parts.append(vrt[end:])
+    return "".join(parts)
 
 
 @sign.register(Item)
@@ -225,8 +543,7 @@ def sign_item(item: Item, copy: bool = True) -> Item:
     """
     if copy:
         item = item.clone()
-    for key in item.assets:
-        _sign_asset_in_place(item.assets[key])
+    _sign_assets_in_place(list(item.assets.values()))
     return item
 
 
@@ -257,46 +574,87 @@ def _sign_asset_in_place(asset: Asset) -> Asset:
         Asset: Input Asset object modified in place: the HREF is replaced
         with a signed version.
     """
-    asset.href = sign(asset.href)
+    asset.href = sign_string(asset.href)
     _sign_fsspec_asset_in_place(asset)
     return asset
 
 
+def _sign_assets_in_place(assets: List[Asset]) -> None:
+    signed_hrefs = _sign_asset_hrefs(
+        [asset.href for asset in assets],
+        [_fsspec_location(asset.extra_fields, asset.href) for asset in assets],
+    )
+    for asset, href in zip(assets, signed_hrefs):
+        asset.href = href
+
+
+def _sign_asset_dicts_in_place(assets: List[Dict[str, Any]]) -> None:
+    signed_hrefs = _sign_asset_hrefs(
+        [asset["href"] for asset in assets],
+        [_fsspec_location(asset, asset["href"]) for asset in assets],
+    )
+    for asset, href in zip(assets, signed_hrefs):
+        if href is not asset["href"]:
+            # Unsigned URLs come back as the same object, and are left alone
+            asset["href"] = href
+
+
+def _sign_asset_hrefs(
+    hrefs: List[str], fsspec_locations: List[Optional[FsspecLocation]]
+) -> List[str]:
+    """Sign asset HREFs, and add credentials to the fsspec assets among them
+
+    HREFs are usually URLs but may be VRTs, and are signed as by
+    :func:`sign_string`. The tokens for the URLs' and the fsspec assets'
+    containers are requested concurrently, in a single batch.
+    """
+    is_vrt = [is_vrt_string(href) for href in hrefs]
+    locations = [
+        None if vrt else _blob_location(href) for href, vrt in zip(hrefs, is_vrt)
+    ]
+    fsspec_assets = [location for location in fsspec_locations if location is not None]
+    unique_locations = {location for location in locations if location is not None}
+    unique_locations.update(location[1:] for location in fsspec_assets)
+    _prefetch_tokens(unique_locations)
+    _sign_fsspec_locations(fsspec_assets)
+    return [
+        sign_vrt_string(href) if vrt else signed_href
+        for href, vrt, signed_href in zip(hrefs, is_vrt, _sign_urls(hrefs, locations))
+    ]
+
+
 def _sign_fsspec_asset_in_place(asset: AssetLike) -> None:
     if isinstance(asset, Asset):
-        extra_d = asset.extra_fields
-        href = asset.href
+        fsspec_location = _fsspec_location(asset.extra_fields, asset.href)
     else:
-        extra_d = asset
-        href = asset["href"]
-
-    if is_fsspec_asset(extra_d):
-        key: Optional[str]
-
-        storage_options = None
-        for key in ["table:storage_options", "xarray:storage_options"]:
-            if key in extra_d:
-                storage_options = extra_d[key]
-                break
-        if storage_options is None:
-            storage_options = extra_d.get("xarray:open_kwargs", {}).get(
-                "storage_options", None
-            )
-
-        if storage_options is None:
-            storage_options = (
-                extra_d.get("xarray:open_kwargs", {})
-                .get("backend_kwargs", {})
-                .get("storage_options", None)
-            )
-
-        if storage_options is None:
-            return
-        account = storage_options.get("account_name")
-        container = parse_adlfs_url(href)
-        if account and container:
-            token = get_token(account, container)
-            storage_options["credential"] = token.token
+        fsspec_location = _fsspec_location(asset, asset["href"])
+    _sign_fsspec_locations([fsspec_location])
+
+
+def _fsspec_location(
+    extra_fields: Dict[str, Any], href: str
+) -> Optional[FsspecLocation]:
+    """The storage options, account and container of an fsspec asset"""
+    storage_options = _find_storage_options(extra_fields)
+    if storage_options is None:
+        return None
+    account = storage_options["account_name"]
+    container = parse_adlfs_url(href)
+    if account and container:
+        return storage_options, account, container
+    return None
+
+
+def _sign_fsspec_locations(
+    fsspec_locations: Iterable[Optional[FsspecLocation]],
+) -> None:
+    """Add credentials to the storage options of fsspec assets
+
+    The tokens aren't prefetched; callers signing many assets do that first.
+    """
+    locations = [location for location in fsspec_locations if location is not None]
+    for storage_options, account, container in locations:
+        storage_options["credential"] = get_token(account, container).token
 
 
 def sign_assets(item: Item) -> Item:
@@ -327,14 +685,13 @@ def sign_item_collection(
     """
     if copy:
         item_collection = item_collection.clone()
-    for item in item_collection:
-        for key in item.assets:
-            _sign_asset_in_place(item.assets[key])
+    _sign_assets_in_place(
+        [asset for item in item_collection for asset in item.assets.values()]
+    )
     return item_collection
 
 
-@sign.register(ItemSearch)
-def _search_and_sign(search: ItemSearch, copy: bool = True) -> ItemCollection:
+def _search_and_sign(search: "ItemSearch", copy: bool = True) -> ItemCollection:
     """Perform a PySTAC Client search, and sign the resulting item collection
 
     Args:
@@ -347,11 +704,14 @@ def _search_and_sign(search: ItemSearch, copy: bool = True) -> ItemCollection:
         a "msft:expiry" property is added to the Item properties indicating the
         earliest expiry time for any assets that were signed.
     """
-    if pystac_client.__version__ >= "0.5.0":
+    if hasattr(search, "item_collection"):
         items = search.item_collection()
     else:
+        # pystac-client < 0.5.0
         items = search.get_all_items()
-    return sign(items)
+    # The search results aren't shared with the caller, so sign them in place
+    # rather than cloning every item
+    return sign_item_collection(items, copy=False)
 
 
 @sign.register(Collection)
@@ -363,13 +723,14 @@ def sign_collection(collection: Collection, copy: bool = True) -> Collection:
         if assets and not collection.assets:
             collection.assets = deepcopy(assets)
 
-    for key in collection.assets:
-        _sign_asset_in_place(collection.assets[key])
+    _sign_assets_in_place(list(collection.assets.values()))
     return collection
 
 
 @sign.register(collections.abc.Mapping)
-def sign_mapping(mapping: Mapping, copy: bool = True) -> Mapping:
+def sign_mapping(
+    mapping: Mapping, copy: bool = True, strict_copy: bool = False
+) -> Mapping:
     """
     Sign a mapping.
 
@@ -379,34 +740,55 @@ def sign_mapping(mapping: Mapping, copy: bool = True) -> Mapping:
         The mapping (e.g. dictionary) to sign. This method can sign
 
             * Kerchunk-style references, which signs all URLs under the
-              ``templates`` key. See https://fsspec.github.io/kerchunk/
-              for more.
+              ``templates`` key and the URLs of references under the ``refs``
+              key. See https://fsspec.github.io/kerchunk/ for more.
             * STAC items
             * STAC collections
             * STAC ItemCollections
 
-        copy: Whether to copy (clone) the mapping or mutate it inplace.
+        copy: Whether to copy the mapping or mutate it inplace. Only the parts
+            of the mapping that signing modifies (the assets, or the references)
+            are copied; everything else is shared with ``mapping``.
+        strict_copy: Whether to copy the whole mapping (with ``copy.deepcopy``),
+            so that nothing is shared with ``mapping``. Implies ``copy``.
     Returns:
         signed (Mapping): The dictionary, now with signed URLs.
     """
-    if copy:
+    is_references = all(k in mapping for k in ["version", "templates", "refs"])
+    if strict_copy:
         mapping = deepcopy(mapping)
+    elif copy:
+        mapping = _copy_for_signing(mapping, is_references)
 
     types = (STACObjectType.ITEM, STACObjectType.COLLECTION)
-    if all(k in mapping for k in ["version", "templates", "refs"]):
+    if is_references:
+        # References are [url, offset, length] (or [url]); many chunks usually
+        # share a handful of URLs, so each unique URL is signed only once
+        ref_urls = {
+            v[0]
+            for v in mapping["refs"].values()
+            if isinstance(v, list) and v and isinstance(v[0], str)
+        }
+        urls = list(ref_urls.union(mapping["templates"].values()))
+        signed_urls = dict(zip(urls, sign_urls(urls)))
+
         for k, v in mapping["templates"].items():
-            mapping["templates"][k] = sign_url(v)
+            mapping["templates"][k] = signed_urls[v]
+        for v in mapping["refs"].values():
+            if isinstance(v, list) and v and isinstance(v[0], str):
+                v[0] = signed_urls[v[0]]
 
     elif identify_stac_object_type(cast(Dict[str, Any], mapping)) in types:
-        for k, v in mapping["assets"].items():
-            v["href"] = sign_url(v["href"])
-            _sign_fsspec_asset_in_place(v)
+        _sign_asset_dicts_in_place(list(mapping["assets"].values()))
 
     elif mapping.get("type") == "FeatureCollection" and mapping.get("features"):
-        for feature in mapping["features"]:
-            for k, v in feature.get("assets", {}).items():
-                v["href"] = sign_url(v["href"])
-                _sign_fsspec_asset_in_place(v)
+        _sign_asset_dicts_in_place(
+            [
+                v
+                for feature in mapping["features"]
+                for v in feature.get("assets", {}).values()
+            ]
+        )
 
     return mapping
 
@@ -414,6 +796,58 @@ def sign_mapping(mapping: Mapping, copy: bool = True) -> Mapping:
 sign_reference_file = sign_mapping
 
 
+def _copy_for_signing(mapping: Mapping, is_references: bool) -> Dict[str, Any]:
+    """Copy the parts of a mapping that sign_mapping modifies
+
+    Deep copying a whole ItemCollection spends most of its time on geometries
+    and properties that signing never touches.
+    """
+    mapping = dict(mapping)
+    if is_references:
+        mapping["templates"] = dict(mapping["templates"])
+        mapping["refs"] = {
+            k: list(v) if isinstance(v, list) else v for k, v in mapping["refs"].items()
+        }
+    elif isinstance(mapping.get("assets"), collections.abc.Mapping):
+        # Storage options are nested within the asset, so copy each one deeply
+        mapping["assets"] = deepcopy(mapping["assets"])
+    elif isinstance(mapping.get("features"), list):
+        mapping["features"] = [
+            _copy_for_signing(feature, False) for feature in mapping["features"]
+        ]
+    return mapping
+
+
+@lru_cache(maxsize=None)
+def _get_session(retry_total: int, retry_backoff_factor: float) -> "requests.Session":
+    """
+    Get the session used for token requests with this retry policy.
+
+    Sessions are shared between calls so that connections to the SAS token
+    endpoint are kept alive, rather than paying for a new TLS handshake on
+    every cache miss.
+    """
+    import requests
+    import requests.adapters
+    import urllib3.util.retry
+
+    session = requests.Session()
+    retry = urllib3.util.retry.Retry(
+        total=retry_total,
+        backoff_factor=retry_backoff_factor,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=8, pool_maxsize=32, max_retries=retry
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = (
+        f"planetary-computer/{__version__} {requests.utils.default_user_agent()}"
+    )
+    return session
+
+
 def get_token(
     account_name: str,
     container_name: str,
@@ -446,31 +880,180 @@ def get_token(
     settings = Settings.get()
     token_request_url = f"{settings.sas_url}/{account_name}/{container_name}"
     token = TOKEN_CACHE.get(token_request_url)
+    if _is_fresh(token):
+        if not _is_fresh(token, _BACKGROUND_REFRESH_MARGIN):
+            _refresh_in_background(
+                token_request_url, settings, retry_total, retry_backoff_factor
+            )
+        return cast(SASToken, token)
+
+    with TOKEN_CACHE.lock(token_request_url):
+        # Another thread may have refreshed the token while we waited
+        token = TOKEN_CACHE.get(token_request_url)
+        if not _is_fresh(token):
+            token = _fetch_token(
+                token_request_url, settings, retry_total, retry_backoff_factor
+            )
+            TOKEN_CACHE[token_request_url] = token
+    return cast(SASToken, token)
 
-    # Refresh the token if there's less than a minute remaining,
-    # in order to give a small amount of buffer
-    if not token or token.ttl() < 60:
-        session = requests.Session()
-        retry = urllib3.util.retry.Retry(
-            total=retry_total,
-            backoff_factor=retry_backoff_factor,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = requests.adapters.HTTPAdapter(max_retries=retry)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        response = session.get(
-            token_request_url,
-            headers=(
-                {"Ocp-Apim-Subscription-Key": settings.subscription_key}
-                if settings.subscription_key
-                else None
-            ),
-        )
-        response.raise_for_status()
 
-        token = SASToken(**response.json())
-        if not token:
-            raise ValueError(f"No token found in response: {response.json()}")
-        TOKEN_CACHE[token_request_url] = token
+def _fetch_token(
+    token_request_url: str,
+    settings: Settings,
+    retry_total: int,
+    retry_backoff_factor: float,
+) -> SASToken:
+    """A new token, from the token cache file or else from the SAS API"""
+    if settings.token_cache_file:
+        # Another process may have requested the token already
+        token = _read_token_file(settings.token_cache_file, token_request_url)
+        if token is not None:
+            return token
+
+    token = _request_token(
+        token_request_url,
+        settings.subscription_key,
+        retry_total,
+        retry_backoff_factor,
+    )
+    if settings.token_cache_file:
+        _write_token_file(settings.token_cache_file, token_request_url, token)
     return token
+
+
+# The earliest time (on the monotonic clock) to try refreshing each token in
+# the background again, so a failing SAS API isn't retried on every call
+_next_background_refresh: Dict[str, float] = {}
+_next_background_refresh_lock = threading.Lock()
+
+
+def _refresh_in_background(
+    token_request_url: str,
+    settings: Settings,
+    retry_total: int,
+    retry_backoff_factor: float,
+) -> None:
+    """Start refreshing a token that's close to expiring, unless already started"""
+    now = time.monotonic()
+    with _next_background_refresh_lock:
+        if now < _next_background_refresh.get(token_request_url, 0):
+            return
+        _next_background_refresh[token_request_url] = now + 30
+
+    def refresh() -> None:
+        with TOKEN_CACHE.lock(token_request_url):
+            token = TOKEN_CACHE.get(token_request_url)
+            if _is_fresh(token, _BACKGROUND_REFRESH_MARGIN):
+                return
+            try:
+                token = _fetch_token(
+                    token_request_url, settings, retry_total, retry_backoff_factor
+                )
+            except Exception:
+                # The current token is still valid. If refreshing keeps failing,
+                # get_token requests a new token (raising any error) once the
+                # current one is about to expire.
+                return
+            TOKEN_CACHE[token_request_url] = token
+
+    # A daemon thread, so that a slow token request doesn't delay exiting
+    threading.Thread(target=refresh, daemon=True).start()
+
+
+def _reset_after_fork() -> None:
+    """Drop the state a forked child can't share with its parent
+
+    The child would otherwise reuse the parent's pooled connections, and any
+    lock held by another thread (such as a background refresh) at the time of
+    the fork would never be released. Cached tokens remain valid.
+    """
+    global _next_background_refresh_lock
+    _get_session.cache_clear()
+    TOKEN_CACHE._reset_locks()
+    _next_background_refresh.clear()
+    _next_background_refresh_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    # Not available on Windows, which doesn't fork
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _load_token_file(path: str) -> Dict[str, SASToken]:
+    try:
+        with open(os.path.expanduser(path), "rb") as f:
+            content = _json_loads(f.read())
+        return {k: SASToken.from_dict(v) for k, v in content.items()}
+    except (OSError, ValueError, TypeError, AttributeError):
+        # The file is only a cache: a missing or corrupt one is ignored
+        return {}
+
+
+def _read_token_file(path: str, token_request_url: str) -> Optional[SASToken]:
+    """The token for a signing URL from the token cache file, if it has one
+
+    Tokens that are due to be refreshed in the background are ignored, so a
+    token from the file doesn't trigger a refresh as soon as it's cached.
+    """
+    token = _load_token_file(path).get(token_request_url)
+    if _is_fresh(token, _BACKGROUND_REFRESH_MARGIN):
+        return token
+    return None
+
+
+def _write_token_file(path: str, token_request_url: str, token: SASToken) -> None:
+    """Add a token to the token cache file, dropping any expired tokens
+
+    Tokens for the same container are interchangeable, so concurrent writers
+    are fine: the file is replaced atomically and the last writer wins.
+    """
+    path = os.path.expanduser(path)
+    tokens = {k: v for k, v in _load_token_file(path).items() if _is_fresh(v)}
+    tokens[token_request_url] = token
+    try:
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # mkstemp creates the file readable by the current user only
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({k: v.to_dict() for k, v in tokens.items()}, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+def _request_token(
+    token_request_url: str,
+    subscription_key: Optional[str],
+    retry_total: int,
+    retry_backoff_factor: float,
+) -> SASToken:
+    session = _get_session(retry_total, retry_backoff_factor)
+    response = session.get(
+        token_request_url, headers=_token_request_headers(subscription_key)
+    )
+    response.raise_for_status()
+    return _parse_token_response(response.content)
+
+
+@lru_cache(maxsize=8)
+def _token_request_headers(
+    subscription_key: Optional[str],
+) -> Optional[Mapping[str, str]]:
+    # Built once per subscription key. Callers must not mutate the result.
+    if not subscription_key:
+        return None
+    return {"Ocp-Apim-Subscription-Key": subscription_key}
+
+
+def _parse_token_response(content: bytes) -> SASToken:
+    body = _json_loads(content)
+    try:
+        return SASToken.from_dict(body)
+    except ValueError as e:
+        raise ValueError(f"No token found in response: {body}") from e
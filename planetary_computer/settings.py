@@ -24,10 +24,17 @@ def set_subscription_key(key: str) -> None:
     Settings.get().subscription_key = key
 
 
+@lru_cache(maxsize=1)
+def _load_settings_env_file() -> None:
+    # load_dotenv never overrides variables that are already set, so loading
+    # the file again would only repeat the same work
+    dotenv.load_dotenv(os.path.expanduser(SETTINGS_ENV_FILE))
+
+
 def _from_env(key: str) -> Optional[str]:
     value = os.environ.get(key)
     if value is None:
-        dotenv.load_dotenv(os.path.expanduser(SETTINGS_ENV_FILE))
+        _load_settings_env_file()
         value = os.environ.get(key)
     return value
 
@@ -40,6 +47,10 @@ def _sas_url_default() -> str:
     return _from_env("PC_SDK_SAS_URL") or DEFAULT_SAS_TOKEN_ENDPOINT
 
 
+def _token_cache_file_default() -> Optional[str]:
+    return _from_env("PC_SDK_TOKEN_CACHE_FILE")
+
+
 @dataclasses.dataclass
 class Settings:
     """PC SDK configuration settings
@@ -58,6 +69,9 @@ class Settings:
         default_factory=_subscription_key_default
     )
     sas_url: Optional[str] = dataclasses.field(default_factory=_sas_url_default)
+    token_cache_file: Optional[str] = dataclasses.field(
+        default_factory=_token_cache_file_default
+    )
 
     @staticmethod
     @lru_cache(maxsize=1)
@@ -11,8 +11,9 @@ def parse_blob_url(parsed_url: ParseResult) -> Tuple[str, str]:
 
     Parameters
     ----------
-    url: str
-        URL to extract information from
+    parsed_url: ParseResult
+        The blob URL to extract information from, as parsed by
+        ``urllib.parse.urlparse``
 
     Returns
     -------
@@ -66,34 +67,58 @@ def is_fsspec_asset(asset: Union[pystac.Asset, Dict[str, Any]]) -> bool:
     else:
         extra_fields = asset
 
-    result = (
-        ("account_name" in extra_fields.get("table:storage_options", {}))
-        or ("account_name" in extra_fields.get("xarray:storage_options", {}))
-        or (
-            "account_name"
-            in extra_fields.get("xarray:open_kwargs", {}).get("storage_options", {})
-        )
-        or (
-            "account_name"
-            in extra_fields.get("xarray:open_kwargs", {})
-            .get("backend_kwargs", {})
-            .get("storage_options", {})
-        )
-    )
+    return _find_storage_options(extra_fields) is not None
+
+
+def _find_storage_options(extra_fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    The first storage options with an "account_name" in an asset's fields.
 
-    return result
+    See :func:`is_fsspec_asset` for the locations searched. The storage
+    options are returned as-is, so they can be updated in place.
+    """
+    for key in ["table:storage_options", "xarray:storage_options"]:
+        storage_options = extra_fields.get(key)
+        if storage_options and "account_name" in storage_options:
+            return storage_options
+
+    # Walk the (rarely present) open_kwargs just once
+    open_kwargs = extra_fields.get("xarray:open_kwargs")
+    if open_kwargs:
+        storage_options = open_kwargs.get("storage_options")
+        if storage_options and "account_name" in storage_options:
+            return storage_options
+        backend_kwargs = open_kwargs.get("backend_kwargs")
+        if backend_kwargs:
+            storage_options = backend_kwargs.get("storage_options")
+            if storage_options and "account_name" in storage_options:
+                return storage_options
+
+    return None
 
 
 def is_vrt_string(s: str) -> bool:
     """
     Check whether a string looks like a VRT
     """
-    return s.strip().startswith("<VRTDataset") and s.strip().endswith("</VRTDataset>")
+    # Skip surrounding whitespace by index, rather than copying a possibly
+    # large string with strip()
+    start, end = 0, len(s)
+    while start < end and s[start].isspace():
+        start += 1
+    while end > start and s[end - 1].isspace():
+        end -= 1
+    return s.startswith("<VRTDataset", start, end) and s.endswith(
+        "</VRTDataset>", start, end
+    )
 
 
+# The account and container character classes can't overlap with what follows
+# them, so matching never needs to backtrack. The blob runs to the end of the
+# XML text, including any query string.
 asset_xpr = re.compile(
-    r"https://(?P<account>[A-z0-9]+?)"
+    r"https://(?P<account>[A-Za-z0-9]+)"
     r"\.blob\.core\.windows\.net/"
-    r"(?P<container>.+?)"
+    r"(?P<container>[^/<?]+)"
     r"/(?P<blob>[^<]+)"
 )
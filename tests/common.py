@@ -0,0 +1,42 @@
+"""Constants and helpers shared by the signing test modules"""
+
+import os
+from pathlib import Path
+
+import responses
+
+from planetary_computer.sas import TOKEN_CACHE
+
+ACCOUNT_NAME = "naipeuwest"
+CONTAINER_NAME = "naip"
+TOKEN_BASE_URL = "https://planetarycomputer.microsoft.com/api/sas/v1/token"
+TOKEN_REQUEST_URL = f"{TOKEN_BASE_URL}/{ACCOUNT_NAME}/{CONTAINER_NAME}"
+
+EXP_IMAGE = f"https://{ACCOUNT_NAME}.blob.core.windows.net/{CONTAINER_NAME}/01.tif"
+EXP_METADATA = f"https://{ACCOUNT_NAME}.blob.core.windows.net/{CONTAINER_NAME}/01.txt"
+EXP_THUMBNAIL = f"https://{ACCOUNT_NAME}.blob.core.windows.net/{CONTAINER_NAME}/01.jpg"
+
+SENTINEL_THUMBNAIL = (
+    "https://sentinel2l2a01.blob.core.windows.net/sentinel2-l2/10/T/ET/2020/10/02/"
+    "S2B_MSIL2A_20201002T191229_N0212_R056_T10TET_20201004T193349.SAFE"
+    "/GRANULE/L2A_T10TET_A018672_20201002T192031/QI_DATA/T10TET_20201002T191229_PVI.tif"
+)
+
+SAS_TOKEN = "st=2020-01-01&se=2099-01-01&sp=rl&sv=2020-06-12&sr=c&sig=abc"
+TOKEN_RESPONSE = {"msft:expiry": "2099-01-01T00:00:00Z", "token": SAS_TOKEN}
+
+PC_SEARCH_URL = "https://planetarycomputer.microsoft.com/api/stac/v1/search"
+HERE = Path(__file__).parent
+DATA_FILES = os.fspath(HERE / "data-files")
+
+
+def mock_token(
+    account_name: str = ACCOUNT_NAME, container_name: str = CONTAINER_NAME
+) -> responses.BaseResponse:
+    """Mock the SAS API's token for a container, within ``@responses.activate``
+
+    Any cached token for the container is dropped, so that it's requested.
+    """
+    token_request_url = f"{TOKEN_BASE_URL}/{account_name}/{container_name}"
+    TOKEN_CACHE.pop(token_request_url, None)
+    return responses.get(token_request_url, json=TOKEN_RESPONSE)
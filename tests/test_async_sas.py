@@ -0,0 +1,142 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Union
+from unittest import mock
+
+import httpx
+from pystac import Item, ItemCollection
+
+import planetary_computer as pc
+from planetary_computer.async_sas import async_get_token
+from planetary_computer.sas import TOKEN_CACHE, SASToken
+from planetary_computer.settings import Settings
+
+from .common import (
+    ACCOUNT_NAME,
+    CONTAINER_NAME,
+    DATA_FILES,
+    SAS_TOKEN,
+    SENTINEL_THUMBNAIL,
+    TOKEN_BASE_URL,
+    TOKEN_REQUEST_URL,
+    TOKEN_RESPONSE,
+)
+
+
+def get_sample_item() -> Item:
+    return Item.from_file(os.path.join(DATA_FILES, "sample-item.json"))
+
+
+def mock_client(requested: List[str], status_codes: List[int]) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        status_code = status_codes.pop(0) if status_codes else 200
+        return httpx.Response(status_code, json=TOKEN_RESPONSE)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_async_sign_url() -> None:
+    TOKEN_CACHE.clear()
+    requested: List[str] = []
+    url = get_sample_item().assets["image"].href
+
+    async def main() -> str:
+        async with mock_client(requested, [503]) as client:
+            return await pc.async_sign_url(url, client=client)
+
+    result = asyncio.run(main())
+    assert result == f"{url}?{SAS_TOKEN}"
+    assert requested == [TOKEN_REQUEST_URL] * 2
+
+
+def test_async_sign_item_collection() -> None:
+    TOKEN_CACHE.clear()
+    requested: List[str] = []
+    items = [get_sample_item() for _ in range(3)]
+    for item in items:
+        item.assets["thumbnail"].href = SENTINEL_THUMBNAIL
+    item_collection = ItemCollection(items)
+
+    async def main() -> ItemCollection:
+        async with mock_client(requested, []) as client:
+            return await pc.async_sign_item_collection(item_collection, client=client)
+
+    result = asyncio.run(main())
+    assert result is not item_collection
+    for item in result:
+        assert item.assets["image"].href.endswith(SAS_TOKEN)
+        assert item.assets["thumbnail"].href.endswith(SAS_TOKEN)
+    assert sorted(requested) == [
+        TOKEN_REQUEST_URL,
+        f"{TOKEN_BASE_URL}/sentinel2l2a01/sentinel2-l2",
+    ]
+
+
+def test_async_get_token_retries() -> None:
+    TOKEN_CACHE.clear()
+    requested: List[str] = []
+    failures: List[Union[Exception, httpx.Response]] = [
+        httpx.ConnectError("Connection refused"),
+        httpx.Response(503, headers={"Retry-After": "5"}),
+        httpx.Response(503),
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        if failures:
+            failure = failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return failure
+        return httpx.Response(200, json=TOKEN_RESPONSE)
+
+    async def main() -> str:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            token = await async_get_token(ACCOUNT_NAME, CONTAINER_NAME, client=client)
+        return token.token
+
+    with mock.patch("asyncio.sleep", mock.AsyncMock()) as sleep:
+        assert asyncio.run(main()) == SAS_TOKEN
+    assert requested == [TOKEN_REQUEST_URL] * 4
+    # No delay for the first retry, then Retry-After, then the backoff
+    assert [call.args[0] for call in sleep.call_args_list] == [0, 5.0, 1.6]
+
+
+def test_async_api_imported_lazily() -> None:
+    code = (
+        "import sys, planetary_computer as pc; "
+        "assert 'asyncio' not in sys.modules; "
+        "pc.async_sign_url; "
+        "assert 'asyncio' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_async_get_token_skips_expiring_cache_file_token(tmp_path: Path) -> None:
+    TOKEN_CACHE.clear()
+    requested: List[str] = []
+    # Due to be refreshed in the background, so get_token wouldn't use it either
+    expiring = SASToken.from_dict(TOKEN_RESPONSE)
+    expiring.expiry = datetime.now(timezone.utc) + timedelta(seconds=200)
+    token_cache_file = tmp_path / "token_cache.json"
+    token_cache_file.write_text(json.dumps({TOKEN_REQUEST_URL: expiring.to_dict()}))
+
+    async def main() -> SASToken:
+        async with mock_client(requested, []) as client:
+            return await async_get_token(ACCOUNT_NAME, CONTAINER_NAME, client=client)
+
+    settings = Settings.get()
+    old_token_cache_file = settings.token_cache_file
+    try:
+        settings.token_cache_file = os.fspath(token_cache_file)
+        token = asyncio.run(main())
+    finally:
+        settings.token_cache_file = old_token_cache_file
+    assert requested == [TOKEN_REQUEST_URL]
+    assert token.expiry.year == 2099
@@ -1,8 +1,13 @@
 import os
 import unittest
+from unittest import mock
 
 import planetary_computer as pc
-from planetary_computer.settings import SETTINGS_ENV_PREFIX, Settings
+from planetary_computer.settings import (
+    SETTINGS_ENV_PREFIX,
+    Settings,
+    _load_settings_env_file,
+)
 
 
 class TestSettings(unittest.TestCase):
@@ -15,3 +20,27 @@ class TestSettings(unittest.TestCase):
         finally:
             if old_key:
                 os.environ[key_env_var] = old_key
+
+    def test_settings_are_cached(self) -> None:
+        settings = Settings.get()
+        self.assertIs(Settings.get(), settings)
+
+        old_key = settings.subscription_key
+        try:
+            pc.set_subscription_key("PHILLY")
+            self.assertIs(Settings.get(), settings)
+            self.assertEqual(settings.subscription_key, "PHILLY")
+        finally:
+            settings.subscription_key = old_key
+
+    def test_env_file_loaded_once(self) -> None:
+        _load_settings_env_file.cache_clear()
+        try:
+            with mock.patch("dotenv.load_dotenv") as load_dotenv, mock.patch.dict(
+                os.environ, clear=True
+            ):
+                Settings()
+                Settings()
+            load_dotenv.assert_called_once()
+        finally:
+            _load_settings_env_file.cache_clear()
@@ -1,7 +1,15 @@
 import os
 import json
+import pickle
+from datetime import datetime, timedelta, timezone
+import threading
+import time
 import unittest
-from urllib.parse import parse_qs, urlparse
+from unittest import mock
+from copy import deepcopy
+from functools import lru_cache
+from typing import Any, Dict
+from urllib.parse import urlparse
 from pathlib import Path
 import warnings
 import pystac
@@ -12,30 +20,53 @@ import responses
 import requests
 
 import planetary_computer as pc
-from planetary_computer.utils import parse_blob_url, is_fsspec_asset, parse_adlfs_url
-from planetary_computer.sas import get_token, TOKEN_CACHE
+from planetary_computer.utils import (
+    asset_xpr,
+    parse_blob_url,
+    is_fsspec_asset,
+    is_vrt_string,
+    parse_adlfs_url,
+)
+from planetary_computer.sas import (
+    get_token,
+    SASToken,
+    TOKEN_CACHE,
+    _fsspec_location,
+    _get_session,
+    _is_fresh,
+    _prefetch_tokens,
+    sign_mapping,
+)
+from planetary_computer.settings import Settings
 from pystac import Asset, Item, ItemCollection
 from pystac_client import ItemSearch
 
-
-ACCOUNT_NAME = "naipeuwest"
-CONTAINER_NAME = "naip"
-TOKEN_REQUEST_URL = (
-    "https://planetarycomputer.microsoft.com/api/sas/v1/token/naipeuwest/naip"
+from .common import (
+    ACCOUNT_NAME,
+    CONTAINER_NAME,
+    DATA_FILES,
+    EXP_IMAGE,
+    EXP_METADATA,
+    EXP_THUMBNAIL,
+    PC_SEARCH_URL,
+    SAS_TOKEN,
+    SENTINEL_THUMBNAIL,
+    TOKEN_REQUEST_URL,
+    TOKEN_RESPONSE,
+    mock_token,
 )
 
-EXP_IMAGE = f"https://{ACCOUNT_NAME}.blob.core.windows.net/{CONTAINER_NAME}/01.tif"
-EXP_METADATA = f"https://{ACCOUNT_NAME}.blob.core.windows.net/{CONTAINER_NAME}/01.txt"
-EXP_THUMBNAIL = f"https://{ACCOUNT_NAME}.blob.core.windows.net/{CONTAINER_NAME}/01.jpg"
 
-SENTINEL_THUMBNAIL = (
-    "https://sentinel2l2a01.blob.core.windows.net/sentinel2-l2/10/T/ET/2020/10/02/"
-    "S2B_MSIL2A_20201002T191229_N0212_R056_T10TET_20201004T193349.SAFE"
-    "/GRANULE/L2A_T10TET_A018672_20201002T192031/QI_DATA/T10TET_20201002T191229_PVI.tif"
-)
+EXP_IMAGE_PARSED = urlparse(EXP_IMAGE)
+VRT_STRING = Path(DATA_FILES, "stacit.vrt").read_text()
 
-PC_SEARCH_URL = "https://planetarycomputer.microsoft.com/api/stac/v1/search"
-HERE = Path(__file__).parent
+
+def has_sas_se(url: str) -> bool:
+    """Whether a URL's query string has the "se" (signed expiry) parameter"""
+    query_start = url.find("?")
+    return query_start != -1 and (
+        url.startswith("se=", query_start + 1) or "&se=" in url[query_start:]
+    )
 
 
 def resolve(item: Item) -> Item:
@@ -43,26 +74,33 @@ def resolve(item: Item) -> Item:
     return item
 
 
+@lru_cache(maxsize=None)
+def load_data_file(name: str) -> Dict[str, Any]:
+    # Parsed once per test session; callers must copy before modifying
+    with open(os.path.join(DATA_FILES, name)) as f:
+        return json.load(f)
+
+
+def read_item(name: str) -> Item:
+    file_path = os.path.join(DATA_FILES, name)
+    # from_dict copies the dictionary, so the cached one isn't modified
+    return resolve(Item.from_dict(load_data_file(name), href=file_path, migrate=True))
+
+
 def get_sample_item() -> Item:
-    file_path = os.fspath(HERE.joinpath("data-files/sample-item.json"))
-    return resolve(Item.from_file(file_path))
+    return read_item("sample-item.json")
 
 
 def get_sample_zarr_item() -> Item:
-    file_path = os.fspath(HERE.joinpath("data-files/sample-zarr-item.json"))
-    return resolve(Item.from_file(file_path))
+    return read_item("sample-zarr-item.json")
 
 
 def get_sample_zarr_open_dataset_item() -> Item:
-    file_path = os.fspath(
-        HERE.joinpath("data-files/sample-zarr-open-dataset-item.json")
-    )
-    return resolve(Item.from_file(file_path))
+    return read_item("sample-zarr-open-dataset-item.json")
 
 
 def get_sample_tabular_item() -> Item:
-    file_path = os.fspath(HERE.joinpath("data-files/sample-tabular-item.json"))
-    return resolve(Item.from_file(file_path))
+    return read_item("sample-tabular-item.json")
 
 
 def get_sample_item_collection() -> ItemCollection:
@@ -70,18 +108,33 @@ def get_sample_item_collection() -> ItemCollection:
 
 
 def get_sample_references() -> dict:
-    with open(os.fspath(HERE.joinpath("data-files/sample-reference-file.json"))) as f:
-        references = json.load(f)
-    return references
+    return deepcopy(load_data_file("sample-reference-file.json"))
 
 
 def get_sample_collection() -> pystac.Collection:
-    with open(os.fspath(HERE.joinpath("data-files/sample-collection.json"))) as f:
-        collection = json.load(f)
-    return pystac.Collection.from_dict(collection)
+    return pystac.Collection.from_dict(load_data_file("sample-collection.json"))
+
+
+def setUpModule() -> None:
+    # Most tests sign assets in the sample item's container. Seed the cache
+    # with a token for it, so they don't need the SAS API. Tests that clear the
+    # cache mock the token requests they make.
+    TOKEN_CACHE[TOKEN_REQUEST_URL] = SASToken.from_dict(TOKEN_RESPONSE)
 
 
 class TestSigning(unittest.TestCase):
+    signed_item: Item
+    signed_asset: Asset
+    signed_url: str
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Shared by the tests that only inspect signed objects. Don't modify them.
+        item = get_sample_item()
+        cls.signed_item = pc.sign(item)
+        cls.signed_asset = pc.sign(item.assets["image"])
+        cls.signed_url = pc.sign(EXP_IMAGE)
+
     def assertRootResolved(self, item: Item) -> None:
         root_link = item.get_root_link()
         self.assertIsNotNone(root_link)
@@ -91,25 +144,31 @@ class TestSigning(unittest.TestCase):
     def assertSigned(self, url: str) -> None:
         # Ensure the signed item has an "se" URL parameter added to it,
         # which indicates it has been signed
-        parsed_url = urlparse(url)
-        query_params = parse_qs(parsed_url.query)
-        self.assertIsNotNone(query_params["se"])
+        self.assertTrue(has_sas_se(url), f"{url} is not signed")
 
     def test_parse_blob_url(self) -> None:
-        account, container = parse_blob_url(urlparse(EXP_IMAGE))
+        account, container = parse_blob_url(EXP_IMAGE_PARSED)
         self.assertEqual(ACCOUNT_NAME, account)
         self.assertEqual(CONTAINER_NAME, container)
 
     def test_signed_url(self) -> None:
-        self.assertSigned(pc.sign(EXP_IMAGE))
+        self.assertFalse(has_sas_se(EXP_IMAGE))
+        for case, url in [
+            ("url", self.signed_url),
+            ("asset", self.signed_asset.href),
+            ("item", self.signed_item.assets["image"].href),
+        ]:
+            with self.subTest(case=case):
+                self.assertSigned(url)
 
     def test_unsigned_assets(self) -> None:
-        item = get_sample_item()
+        # Only the raw HREFs are needed, so skip building a pystac Item
+        assets = load_data_file("sample-item.json")["assets"]
 
         # Simple test to ensure the sample image has the data we're expecting
-        self.assertEqual(EXP_IMAGE, item.assets["image"].href)
-        self.assertEqual(EXP_METADATA, item.assets["metadata"].href)
-        self.assertEqual(EXP_THUMBNAIL, item.assets["thumbnail"].href)
+        self.assertEqual(EXP_IMAGE, assets["image"]["href"])
+        self.assertEqual(EXP_METADATA, assets["metadata"]["href"])
+        self.assertEqual(EXP_THUMBNAIL, assets["thumbnail"]["href"])
 
     def verify_signed_urls_in_item(self, signed_item: Item) -> None:
         for key in ["image", "metadata", "thumbnail"]:
@@ -121,12 +180,27 @@ class TestSigning(unittest.TestCase):
             self.assertIs(asset.owner, signed_item)
 
     def test_signed_assets(self) -> None:
-        signed_item = pc.sign(get_sample_item())
-        self.verify_signed_urls_in_item(signed_item)
-        self.verify_asset_owner(signed_item)
-        self.assertRootResolved(signed_item)
+        self.verify_signed_urls_in_item(self.signed_item)
+        self.verify_asset_owner(self.signed_item)
+        self.assertRootResolved(self.signed_item)
+
+    def test_sign_item_clones_assets_once(self) -> None:
+        item = get_sample_item()
+        with mock.patch.object(
+            Asset, "clone", autospec=True, side_effect=Asset.clone
+        ) as clone:
+            pc.sign(item)
+        self.assertEqual(clone.call_count, len(item.assets))
 
+    @responses.activate
     def test_read_signed_asset(self) -> None:
+        mock_token("sentinel2l2a01", "sentinel2-l2")
+        # Blob storage only serves the asset with the token
+        responses.get(
+            SENTINEL_THUMBNAIL,
+            body=b"image",
+            match=[responses.matchers.query_string_matcher(SAS_TOKEN)],
+        )
         signed_href = pc.sign(SENTINEL_THUMBNAIL)
         r = requests.get(signed_href)
         self.assertEqual(r.status_code, 200)
@@ -138,9 +212,15 @@ class TestSigning(unittest.TestCase):
             self.verify_signed_urls_in_item(signed_item)
             self.assertRootResolved(signed_item)
 
+    @responses.activate
     def test_search_and_sign(self) -> None:
         # Filter out a resource warning coming from within the pystac-client search
         warnings.simplefilter("ignore", ResourceWarning)
+        # The token for the search results is cached already (see setUpModule)
+        responses.post(
+            PC_SEARCH_URL,
+            json=ItemCollection([get_sample_item()]).to_dict(),
+        )
 
         search = ItemSearch(
             url=PC_SEARCH_URL,
@@ -155,6 +235,16 @@ class TestSigning(unittest.TestCase):
         for signed_item in signed_item_collection:
             self.verify_signed_urls_in_item(signed_item)
 
+    def test_sign_item_search(self) -> None:
+        search = ItemSearch(url=PC_SEARCH_URL, collections=CONTAINER_NAME)
+        with mock.patch.object(
+            ItemSearch, "item_collection", return_value=get_sample_item_collection()
+        ):
+            signed_item_collection = pc.sign(search)
+        self.assertEqual(len(list(signed_item_collection)), 1)
+        for signed_item in signed_item_collection:
+            self.verify_signed_urls_in_item(signed_item)
+
     def test_sign_assets_deprecated(self) -> None:
         item = get_sample_item()
         with self.assertWarns(FutureWarning):
@@ -163,21 +253,18 @@ class TestSigning(unittest.TestCase):
     def test_public_api(self) -> None:
         item = get_sample_item()
 
-        self.assertEqual(type(pc.sign(item)), type(pc.sign_item(item)))
-        self.assertEqual(
-            type(pc.sign(item.assets["image"])),
-            type(pc.sign_asset(item.assets["image"])),
-        )
-        self.assertEqual(
-            type(pc.sign(item.assets["image"].href)),
-            type(pc.sign_url(item.assets["image"].href)),
-        )
+        for case, signed, expected in [
+            ("item", self.signed_item, pc.sign_item(item)),
+            ("asset", self.signed_asset, pc.sign_asset(item.assets["image"])),
+            ("url", self.signed_url, pc.sign_url(item.assets["image"].href)),
+        ]:
+            with self.subTest(case=case):
+                self.assertEqual(type(signed), type(expected))
 
     def test_get_token(self) -> None:
         result = get_token(account_name=ACCOUNT_NAME, container_name=CONTAINER_NAME)
-        self.assertIn(TOKEN_REQUEST_URL, TOKEN_CACHE)
         self.assertIsInstance(result.token, str)
-        self.assertEqual(result.token, TOKEN_CACHE[TOKEN_REQUEST_URL].token)
+        self.assertIs(result, TOKEN_CACHE[TOKEN_REQUEST_URL])
 
         result2 = get_token(account_name=ACCOUNT_NAME, container_name=CONTAINER_NAME)
         self.assertIs(result, result2)
@@ -228,18 +315,78 @@ class TestSigning(unittest.TestCase):
         self.assertRootResolved(item)
 
     def test_sign_vrt(self) -> None:
-        vrt_string = Path(HERE / "data-files/stacit.vrt").read_text()
-        self.assertEqual(vrt_string.count("?st"), 0)
-        result = pc.sign(vrt_string)
+        self.assertEqual(VRT_STRING.count("?st"), 0)
+        result = pc.sign(VRT_STRING)
         self.assertGreater(result.count("?st"), 0)
 
+    def test_sign_vrt_matches_sign_url(self) -> None:
+        urls = [
+            EXP_IMAGE,
+            SENTINEL_THUMBNAIL,
+            f"{EXP_METADATA}?st=2020-01-01&se=2099-01-01&sp=rl&sig=abc",
+            "https://ai4edatasetspublicassets.blob.core.windows.net/assets/a.png",
+        ]
+        template = "<VRTDataset>{}</VRTDataset>"
+        sources = "".join(
+            f"<SourceFilename>/vsicurl/{url}</SourceFilename>" for url in urls
+        )
+        signed_sources = "".join(
+            f"<SourceFilename>/vsicurl/{pc.sign_url(url)}</SourceFilename>"
+            for url in urls
+        )
+        self.assertEqual(
+            pc.sign(template.format(sources)), template.format(signed_sources)
+        )
+
+    def test_sign_vrt_without_blob_urls(self) -> None:
+        vrt_string = VRT_STRING.replace(".blob.core.windows.net", ".example.com")
+        self.assertIs(pc.sign(vrt_string), vrt_string)
+
+    def test_sign_item_with_vrt_asset(self) -> None:
+        item = get_sample_item()
+        item.assets["vrt"] = Asset(VRT_STRING)
+        expected = pc.sign(VRT_STRING)
+        self.assertEqual(pc.sign(item).assets["vrt"].href, expected)
+        self.assertEqual(pc.sign(item.assets["vrt"]).href, expected)
+        signed_item_collection = pc.sign(ItemCollection([item]))
+        self.assertEqual(signed_item_collection[0].assets["vrt"].href, expected)
+        signed_item_dict = pc.sign(item.to_dict())
+        self.assertEqual(signed_item_dict["assets"]["vrt"]["href"], expected)
+
+    @responses.activate
     def test_sign_references_file(self) -> None:
+        mock_token("nasagddp", "nex-gddp-cmip6")
         references = get_sample_references()
         result = pc.sign(references)
         for v in result["templates"].values():
             self.assertSigned(v)
 
+    @responses.activate
+    def test_sign_references_file_refs(self) -> None:
+        mock_token("nasagddp", "nex-gddp-cmip6")
+        mock_token("sentinel2l2a01", "sentinel2-l2")
+        references = get_sample_references()
+        url = references["templates"]["a"]
+        references["refs"] = {
+            ".zgroup": '{"zarr_format":2}',
+            "hurs/0.0.0": [url, 100, 200],
+            "hurs/1.0.0": [url, 300, 200],
+            "hurs/2.0.0": ["{{b}}", 100, 200],
+            "hurs/3.0.0": [SENTINEL_THUMBNAIL],
+        }
+        result = pc.sign(references)
+        refs = result["refs"]
+        self.assertEqual(refs[".zgroup"], '{"zarr_format":2}')
+        self.assertSigned(refs["hurs/0.0.0"][0])
+        self.assertEqual(refs["hurs/0.0.0"][1:], [100, 200])
+        self.assertEqual(refs["hurs/0.0.0"][0], refs["hurs/1.0.0"][0])
+        self.assertEqual(refs["hurs/2.0.0"], ["{{b}}", 100, 200])
+        self.assertSigned(refs["hurs/3.0.0"][0])
+        self.assertEqual(references["refs"]["hurs/0.0.0"][0], url)
+
+    @responses.activate
     def test_no_double_sign_url(self) -> None:
+        mock_token("sentinel2l2a01", "sentinel2-l2")
         result = pc.sign(SENTINEL_THUMBNAIL)
         result2 = pc.sign(result)
         assert result == result2
@@ -267,6 +414,33 @@ class TestSigning(unittest.TestCase):
         result = pc.sign(feature_collection)
         self.assertSigned(result["features"][0]["assets"]["image"]["href"])
 
+    @responses.activate
+    def test_sign_mapping_copy(self) -> None:
+        mock_token("ai4edataeuwest", "gridmet")
+        mock_token("nasagddp", "nex-gddp-cmip6")
+        zarr_dict = get_sample_zarr_open_dataset_item().to_dict()
+        feature_collection = pystac.ItemCollection([get_sample_item()]).to_dict()
+        references = get_sample_references()
+        references["refs"] = {"hurs/0.0.0": [references["templates"]["a"], 0, 1]}
+        for mapping in [zarr_dict, feature_collection, references]:
+            with self.subTest(mapping=mapping.get("type", "references")):
+                original = json.loads(json.dumps(mapping))
+                pc.sign(mapping)
+                self.assertEqual(mapping, original)
+
+        # Parts that signing doesn't modify aren't copied
+        result = pc.sign(feature_collection)
+        self.assertIs(
+            result["features"][0]["geometry"],
+            feature_collection["features"][0]["geometry"],
+        )
+        result = sign_mapping(feature_collection, strict_copy=True)
+        self.assertIsNot(
+            result["features"][0]["geometry"],
+            feature_collection["features"][0]["geometry"],
+        )
+        self.assertTrue(has_sas_se(result["features"][0]["assets"]["image"]["href"]))
+
     def test_sign_item_inplace(self) -> None:
         item = get_sample_item()
         result = pc.sign(item)
@@ -341,6 +515,30 @@ class TestUtils(unittest.TestCase):
         result = parse_adlfs_url("https://planetarycomputer.microsoft.com")
         self.assertIsNone(result)
 
+    def test_asset_xpr(self) -> None:
+        m = asset_xpr.search(f"<SourceFilename>/vsicurl/{EXP_IMAGE}</SourceFilename>")
+        assert m
+        self.assertEqual(m.group(0), EXP_IMAGE)
+        self.assertEqual(m["account"], ACCOUNT_NAME)
+        self.assertEqual(m["container"], CONTAINER_NAME)
+        self.assertEqual(m["blob"], "01.tif")
+
+        # Matches don't extend across elements
+        container_url = f"https://{ACCOUNT_NAME}.blob.core.windows.net/{CONTAINER_NAME}"
+        self.assertIsNone(asset_xpr.search(f"<a>{container_url}</a><b>/c</b>"))
+
+    def test_is_vrt_string(self) -> None:
+        for s, expected in [
+            ("<VRTDataset></VRTDataset>", True),
+            ("\n  <VRTDataset>\n</VRTDataset>\n", True),
+            ("<VRTDataset>", False),
+            ("</VRTDataset>", False),
+            (EXP_IMAGE, False),
+            ("   ", False),
+            ("", False),
+        ]:
+            self.assertIs(is_vrt_string(s), expected, s)
+
     def test_is_fsspec_url(self) -> None:
         asset = Asset(
             "adlfs://my-container/my/path.ext",
@@ -372,18 +570,361 @@ class TestUtils(unittest.TestCase):
         asset = Asset("adlfs://my-container/my/path.ext")
         self.assertFalse(is_fsspec_asset(asset))
 
+        storage_options = {"account_name": "foo"}
+        for open_kwargs, expected in [
+            ({"storage_options": storage_options}, True),
+            ({"backend_kwargs": {"storage_options": storage_options}}, True),
+            ({"backend_kwargs": {"storage_options": {}}}, False),
+            ({"chunks": {}}, False),
+        ]:
+            asset = Asset(
+                "adlfs://my-container/my/path.ext",
+                extra_fields={"xarray:open_kwargs": open_kwargs},
+            )
+            self.assertIs(is_fsspec_asset(asset), expected)
+
+
+@responses.activate
+def test_sign_url_skips_unsignable_urls() -> None:
+    # No responses are registered, so any token request would fail
+    urls = [
+        "https://landsat-pds.s3.amazonaws.com/c1/L8/139/045/LC08_B4.TIF",
+        "s3://sentinel-cogs/sentinel-s2-l2a-cogs/B04.tif",
+        "data/B04.tif",
+        "https://ai4edatasetspublicassets.blob.core.windows.net/assets/thumbnail.png",
+        f"{EXP_IMAGE}?st=2020-01-01&se=2099-01-01&sp=rl&sig=abc",
+    ]
+    for _ in range(2):
+        for url in urls:
+            assert pc.sign_url(url) is url
+
+
+@responses.activate
+def test_sign_url_with_query_string() -> None:
+    mock_token()
+    # Only the st/se/sp parameters mark a URL as already signed
+    for url in [f"{EXP_IMAGE}?version=1", f"{EXP_IMAGE}?base=1"]:
+        assert pc.sign_url(url).endswith(SAS_TOKEN)
+    assert pc.sign_url(f"{EXP_IMAGE}/") == f"{EXP_IMAGE}/?{SAS_TOKEN}"
+    for url in [f"{EXP_IMAGE}?sp=rl", f"{EXP_IMAGE}?sig=abc&st=2020-01-01"]:
+        assert pc.sign_url(url) == url
+    # An empty value doesn't count
+    assert pc.sign_url(f"{EXP_IMAGE}?se=").endswith(SAS_TOKEN)
+
+
+def test_sas_token_from_dict() -> None:
+    d = {"msft:expiry": "2099-01-01T00:00:00Z", "token": "se=2099-01-01&sig=abc"}
+    token = SASToken.from_dict(d)
+    assert token.expiry.year == 2099
+    assert token.expiry.tzinfo is not None
+    assert token.ttl() > 0
+    assert token.to_dict() == d
+    assert token.sign(EXP_IMAGE).href == f"{EXP_IMAGE}?se=2099-01-01&sig=abc"
+
+    with pytest.raises(ValueError, match="msft:expiry"):
+        SASToken.from_dict({"token": "se=2099-01-01&sig=abc"})
+
+
+def test_sas_token_pydantic_compat() -> None:
+    # Constructions and methods from when SASToken was a pydantic model
+    token = SASToken(**TOKEN_RESPONSE)  # type: ignore [arg-type]
+    assert token == SASToken.from_dict(TOKEN_RESPONSE)
+    expiry: Any = "2099-01-01T00:00:00Z"
+    assert SASToken(expiry=expiry, token=SAS_TOKEN) == token
+    with pytest.warns(FutureWarning):
+        assert SASToken.parse_obj(TOKEN_RESPONSE) == token
+    with pytest.warns(FutureWarning):
+        assert token.dict() == {"expiry": token.expiry, "token": SAS_TOKEN}
+    with pytest.warns(FutureWarning):
+        assert json.loads(token.json(by_alias=True)) == TOKEN_RESPONSE
+
+
+def test_sas_token_ttl() -> None:
+    token = SASToken.from_dict(TOKEN_RESPONSE)
+    expiry = datetime.now(timezone.utc) + timedelta(seconds=100)
+    with mock.patch("time.time", return_value=expiry.timestamp() - 100):
+        # Setting the expiry updates the timestamp that ttl() is based on
+        token.expiry = expiry
+        assert token.ttl() == pytest.approx(100)
+
+
+def test_sas_token_pickle() -> None:
+    token = SASToken.from_dict(TOKEN_RESPONSE)
+    # As if pickled in another process, whose monotonic clock has passed it
+    object.__setattr__(token, "_expiry_monotonic", 0.0)
+    unpickled = pickle.loads(pickle.dumps(token))
+    assert unpickled == token
+    assert unpickled._suffix == token._suffix
+    assert _is_fresh(unpickled)
+
+
+@responses.activate
+def test_get_token_invalid_response() -> None:
+    TOKEN_CACHE.clear()
+    responses.get(TOKEN_REQUEST_URL, json={"msft:expiry": "2099-01-01T00:00:00Z"})
+
+    with pytest.raises(ValueError, match="No token found in response"):
+        get_token(ACCOUNT_NAME, CONTAINER_NAME)
+
+
+@responses.activate
+def test_get_token_refreshes_expiring_token() -> None:
+    rsp = mock_token()
+    expiring = SASToken.from_dict(
+        {"msft:expiry": "2099-01-01T00:00:00Z", "token": "se=old"}
+    )
+    expiring.expiry = datetime.now(timezone.utc) + timedelta(seconds=30)
+    TOKEN_CACHE[TOKEN_REQUEST_URL] = expiring
+
+    token = get_token(ACCOUNT_NAME, CONTAINER_NAME)
+    assert token.token == SAS_TOKEN
+    assert rsp.call_count == 1
+
+    assert get_token(ACCOUNT_NAME, CONTAINER_NAME) is token
+    assert rsp.call_count == 1
+
+
+@responses.activate
+def test_get_token_refreshes_token_in_background() -> None:
+    rsp = mock_token()
+    expiring = SASToken.from_dict(
+        {"msft:expiry": "2099-01-01T00:00:00Z", "token": "se=old"}
+    )
+    expiring.expiry = datetime.now(timezone.utc) + timedelta(seconds=200)
+    TOKEN_CACHE[TOKEN_REQUEST_URL] = expiring
+
+    # The token is still valid, so it's returned while a new one is requested
+    with mock.patch.dict("planetary_computer.sas._next_background_refresh", clear=True):
+        assert get_token(ACCOUNT_NAME, CONTAINER_NAME) is expiring
+    deadline = time.monotonic() + 5
+    while TOKEN_CACHE[TOKEN_REQUEST_URL] is expiring and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert get_token(ACCOUNT_NAME, CONTAINER_NAME).token == SAS_TOKEN
+    assert rsp.call_count == 1
+
+
+@responses.activate
+def test_get_token_subscription_key() -> None:
+    rsp = mock_token()
+    settings = Settings.get()
+    old_key = settings.subscription_key
+    try:
+        pc.set_subscription_key("PHILLY")
+        get_token(ACCOUNT_NAME, CONTAINER_NAME)
+    finally:
+        settings.subscription_key = old_key
+    assert rsp.calls[0].request.headers["Ocp-Apim-Subscription-Key"] == "PHILLY"
+
+
+@responses.activate
+def test_get_token_follows_settings() -> None:
+    rsp = mock_token()
+    other_sas_url = "https://example.com/api/sas/v1/token"
+    other_rsp = responses.get(
+        f"{other_sas_url}/{ACCOUNT_NAME}/{CONTAINER_NAME}", json=TOKEN_RESPONSE
+    )
+    settings = Settings.get()
+    old_sas_url = settings.sas_url
+    try:
+        get_token(ACCOUNT_NAME, CONTAINER_NAME)
+        get_token(ACCOUNT_NAME, CONTAINER_NAME)
+        # Settings are read on each call, so changes apply to the next token
+        settings.sas_url = other_sas_url
+        get_token(ACCOUNT_NAME, CONTAINER_NAME)
+    finally:
+        settings.sas_url = old_sas_url
+    assert rsp.call_count == 1
+    assert other_rsp.call_count == 1
+
+
+@responses.activate
+def test_get_token_cache_file(tmp_path: Path) -> None:
+    rsp = mock_token()
+    token_cache_file = tmp_path / "planetarycomputer" / "token_cache.json"
+    settings = Settings.get()
+    old_token_cache_file = settings.token_cache_file
+    try:
+        settings.token_cache_file = os.fspath(token_cache_file)
+        token = get_token(ACCOUNT_NAME, CONTAINER_NAME)
+        # As if in a new process
+        TOKEN_CACHE.clear()
+        assert get_token(ACCOUNT_NAME, CONTAINER_NAME) == token
+        assert rsp.call_count == 1
+
+        # A corrupt file is ignored, and replaced
+        token_cache_file.write_text("not json")
+        TOKEN_CACHE.clear()
+        assert get_token(ACCOUNT_NAME, CONTAINER_NAME) == token
+        assert rsp.call_count == 2
+    finally:
+        settings.token_cache_file = old_token_cache_file
+    assert json.loads(token_cache_file.read_text()) == {
+        TOKEN_REQUEST_URL: token.to_dict()
+    }
+
+
+@responses.activate
+def test_get_token_reuses_session() -> None:
+    mock_token(ACCOUNT_NAME, "a")
+    mock_token(ACCOUNT_NAME, "b")
+
+    session = _get_session(10, 0.8)
+    assert _get_session(10, 0.8) is session
+    with mock.patch.object(session, "get", wraps=session.get) as get:
+        get_token(ACCOUNT_NAME, "a")
+        get_token(ACCOUNT_NAME, "b")
+    assert get.call_count == 2
+
 
 @responses.activate
 def test_retry() -> None:
     TOKEN_CACHE.clear()
     rsp1 = responses.Response(
         method="GET",
-        url="https://planetarycomputer.microsoft.com/api/sas/v1/token/naipeuwest/naip",
+        url=TOKEN_REQUEST_URL,
         status=503,
     )
     responses.add(rsp1)
 
     with pytest.raises(RetryError):
-        get_token("naipeuwest", "naip")
+        get_token(ACCOUNT_NAME, CONTAINER_NAME)
 
     assert rsp1.call_count == 11
+
+
+@responses.activate
+def test_sign_item_collection_prefetches_tokens() -> None:
+    rsp_naip = mock_token()
+    rsp_sentinel = mock_token("sentinel2l2a01", "sentinel2-l2")
+
+    items = [get_sample_item() for _ in range(3)]
+    for item in items:
+        item.assets["thumbnail"].href = SENTINEL_THUMBNAIL
+
+    result = pc.sign(ItemCollection(items))
+    for item in result:
+        assert "se=" in item.assets["image"].href
+        assert "se=" in item.assets["thumbnail"].href
+
+    assert rsp_naip.call_count == 1
+    assert rsp_sentinel.call_count == 1
+
+    TOKEN_CACHE.clear()
+    result_dict = pc.sign(ItemCollection(items).to_dict())
+    for feature in result_dict["features"]:
+        assert "se=" in feature["assets"]["image"]["href"]
+        assert "se=" in feature["assets"]["thumbnail"]["href"]
+
+    assert rsp_naip.call_count == 2
+    assert rsp_sentinel.call_count == 2
+
+
+@responses.activate
+def test_sign_urls() -> None:
+    rsp = mock_token()
+    public = "https://landsat-pds.s3.amazonaws.com/c1/L8/139/045/LC08_B4.TIF"
+    result = pc.sign_urls(iter([EXP_IMAGE, public, EXP_METADATA]))
+    assert result == [
+        f"{EXP_IMAGE}?{SAS_TOKEN}",
+        public,
+        f"{EXP_METADATA}?{SAS_TOKEN}",
+    ]
+    assert rsp.call_count == 1
+    assert pc.sign_urls([]) == []
+
+
+@responses.activate
+def test_sign_item_collection_prefetches_fsspec_tokens() -> None:
+    zarr_item = get_sample_zarr_item()
+    tabular_item = get_sample_tabular_item()
+    rsps = [
+        mock_token(account, container)
+        for account, container in [
+            _fsspec_location(asset.extra_fields, asset.href)[1:]  # type: ignore
+            for asset in [zarr_item.assets["zarr-abfs"], tabular_item.assets["data"]]
+        ]
+    ]
+
+    result = pc.sign(ItemCollection([zarr_item, tabular_item]))
+    for rsp in rsps:
+        assert rsp.call_count == 1
+    assert "credential" in (
+        result[1].assets["data"].extra_fields["table:storage_options"]
+    )
+
+
+@responses.activate
+def test_sign_vrt_prefetches_tokens() -> None:
+    containers = [f"container{i}" for i in range(4)]
+    rsps = [mock_token(ACCOUNT_NAME, container) for container in containers]
+    vrt_string = "<VRTDataset>{}</VRTDataset>".format(
+        "".join(
+            f"<SourceFilename>/vsicurl/https://{ACCOUNT_NAME}.blob.core.windows.net/"
+            f"{container}/{i}.tif</SourceFilename>"
+            for container in containers
+            for i in range(3)
+        )
+    )
+
+    with mock.patch(
+        "planetary_computer.sas._prefetch_tokens", wraps=_prefetch_tokens
+    ) as prefetch:
+        result = pc.sign(vrt_string)
+    prefetch.assert_called_once_with(
+        {(ACCOUNT_NAME, container) for container in containers}
+    )
+    assert result.count(f"?{SAS_TOKEN}<") == 12
+    for rsp in rsps:
+        assert rsp.call_count == 1
+
+
+@responses.activate
+def test_get_token_concurrent_refresh() -> None:
+    rsp = mock_token()
+    threads = [
+        threading.Thread(target=get_token, args=(ACCOUNT_NAME, CONTAINER_NAME))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert rsp.call_count == 1
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_reset_after_fork() -> None:
+    session = _get_session(10, 0.8)
+    lock = TOKEN_CACHE.lock(TOKEN_REQUEST_URL)
+    with lock:
+        pid = os.fork()
+        if pid == 0:
+            # The child must not inherit the parent's held lock or connections
+            ok = (
+                not TOKEN_CACHE.lock(TOKEN_REQUEST_URL).locked()
+                and _get_session(10, 0.8) is not session
+            )
+            os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    assert TOKEN_CACHE.lock(TOKEN_REQUEST_URL) is lock
+
+
+@responses.activate
+def test_sign_item_collection_prefetches_url_and_fsspec_tokens_together() -> None:
+    tabular_item = get_sample_tabular_item()
+    fsspec_location = _fsspec_location(
+        tabular_item.assets["data"].extra_fields, tabular_item.assets["data"].href
+    )
+    assert fsspec_location is not None
+    locations = {(ACCOUNT_NAME, CONTAINER_NAME), fsspec_location[1:]}
+    for account, container in locations:
+        mock_token(account, container)
+
+    with mock.patch(
+        "planetary_computer.sas._prefetch_tokens", wraps=_prefetch_tokens
+    ) as prefetch:
+        pc.sign(ItemCollection([get_sample_item(), tabular_item]))
+    # Both tokens are requested in a single batch, rather than one at a time
+    prefetch.assert_called_once_with(locations)